@@ -0,0 +1,85 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from risk import RiskAnalyzer
+
+WORDS = [
+    'the', 'product', 'was', 'great', 'and', 'arrived', 'on', 'time', 'but', 'very',
+    'late', 'broken', 'quality', 'service', 'rude', 'expensive', 'cost', 'inventory',
+    'out of stock', 'delivery', 'bad', 'terrible', 'poor', 'worst', 'Shipping', 'DAMAGED',
+    'love', 'it', 'would', 'buy', 'again', 'café', 'don’t'
+]
+RARE_WORDS = ['İnventory', 'KELVIN\u212a']
+
+
+def make_reviews(n, seed=42):
+    """Synthetic reviews of 5 to 30 words drawn from risk keywords and filler"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(5, 30, size=n)
+    words = rng.choice(WORDS, size=int(lengths.sum()))
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    texts = [' '.join(words[bounds[i]:bounds[i + 1]]) for i in range(n)]
+
+    # About 1% of reviews contain characters whose lowercase form is ASCII
+    for i in np.flatnonzero(rng.random(n) < 0.01):
+        texts[i] += ' ' + rng.choice(RARE_WORDS)
+    return [{'id': i, 'text': text} for i, text in enumerate(texts)]
+
+
+def per_dict(analyzer, reviews):
+    """Categorization, counts and negative filter as done by generate_risk_report"""
+    all_risks = []
+    for review in reviews:
+        all_risks.extend(analyzer.categorize_risk(review['text']))
+    risk_counts = {}
+    for risk in all_risks:
+        risk_counts[risk] = risk_counts.get(risk, 0) + 1
+    negative_reviews = [
+        review for review in reviews
+        if any(negative in review['text'].lower()
+               for negative in analyzer.negative_keywords)
+    ]
+    return risk_counts, [review['id'] for review in negative_reviews]
+
+
+def batch(analyzer, reviews):
+    """Same computation with the columnar batch API"""
+    flags, mask = analyzer.analyze_risk_batch(reviews)
+    risk_counts = analyzer.count_risks_batch(flags)
+    ids = reviews['id'] if isinstance(reviews, pd.DataFrame) else reviews.column('id').to_numpy()
+    return risk_counts, np.asarray(ids)[mask].tolist()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the RiskAnalyzer batch API")
+    parser.add_argument('--n', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    analyzer = RiskAnalyzer()
+    reviews = make_reviews(args.n)
+    df = pd.DataFrame(reviews)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    print(f"{args.n} reviews, {os.cpu_count()} CPU(s)")
+    expected, loop_time = timed(per_dict, analyzer, reviews)
+    print(f"per-dict loop : {loop_time:.2f}s")
+    for name, data in [('Arrow table', table), ('DataFrame', df)]:
+        result, batch_time = timed(batch, analyzer, data)
+        assert list(result[0].items()) == list(expected[0].items()), name
+        assert result[1] == expected[1], name
+        print(f"batch ({name}) : {batch_time:.2f}s, {loop_time / batch_time:.1f}x faster, identical results")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import google.generativeai as genai
 from dotenv import load_dotenv
 import pandas as pd
 import json
+from risk_sketch import RiskAggregate
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -12,9 +13,10 @@ genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
 model = genai.GenerativeModel('gemini-pro')
 
 class GeminiRiskAnalyzer:
-    def __init__(self, reviews_df):
+    def __init__(self, reviews_df, triage_model=None):
         """Initialiser l'analyseur avec un DataFrame de reviews"""
         self.df = reviews_df
+        self.triage_model = triage_model
         
     def analyze_review_risks(self, review_text):
         """Analyser les risques d'un avis spécifique avec Gemini"""
@@ -65,55 +67,38 @@ ACTIONS: [list recommended actions, comma-separated]"""
             print(f"Error analyzing review: {e}")
             return None
     
-    def analyze_batch(self, sample_size=10):
-        """Analyser un échantillon d'avis pour obtenir une vue d'ensemble des risques"""
-        # Prendre un échantillon aléatoire d'avis
-        sample = self.df.sample(n=min(sample_size, len(self.df)))
+    def aggregate_batch(self, sample_size=10):
+        """Analyser un échantillon d'avis et renvoyer l'agrégat partiel (fusionnable, sérialisable)"""
+        if self.triage_model is not None:
+            # Envoyer à Gemini uniquement les avis les plus risqués selon le modèle local
+            selected = self.triage_model.select(self.df['Review'], max_items=sample_size)
+            sample = self.df.iloc[selected]
+        else:
+            # Prendre un échantillon aléatoire d'avis
+            sample = self.df.sample(n=min(sample_size, len(self.df)))
         
-        all_risks = []
+        # Chaque résultat est agrégé dès son arrivée, sans conserver la liste des analyses
+        aggregate = RiskAggregate()
         for _, row in sample.iterrows():
             risk_analysis = self.analyze_review_risks(row['Review'])
             if risk_analysis:
-                all_risks.append(risk_analysis)
+                aggregate.add(risk_analysis)
         
-        return self.aggregate_risk_analysis(all_risks)
+        return aggregate
+    
+    def analyze_batch(self, sample_size=10, partial=None):
+        """Analyser un échantillon d'avis pour obtenir une vue d'ensemble des risques"""
+        aggregate = self.aggregate_batch(sample_size)
+        if partial is not None:
+            aggregate.merge(partial)
+        return aggregate.report()
     
-    def aggregate_risk_analysis(self, risk_analyses):
+    def aggregate_risk_analysis(self, risk_analyses, partial=None):
         """Agréger les analyses de risques pour obtenir une vue d'ensemble"""
-        if not risk_analyses:
-            return None
-            
-        # Collecter toutes les catégories de risque uniques
-        all_categories = set()
-        for analysis in risk_analyses:
-            all_categories.update(analysis.get('categories', []))
-            
-        # Calculer la distribution des niveaux de sévérité
-        severity_counts = {
-            'high': 0,
-            'medium': 0,
-            'low': 0
-        }
-        for analysis in risk_analyses:
-            severity = analysis.get('severity', '').lower()
-            if severity in severity_counts:
-                severity_counts[severity] += 1
-                
-        # Collecter toutes les recommandations uniques
-        all_recommendations = set()
-        for analysis in risk_analyses:
-            all_recommendations.update(analysis.get('actions', []))
-        
-        # Créer le rapport agrégé
-        return {
-            'total_reviews_analyzed': len(risk_analyses),
-            'risk_categories': list(all_categories),
-            'severity_distribution': {
-                k: v/len(risk_analyses)*100 for k, v in severity_counts.items()
-            },
-            'key_recommendations': list(all_recommendations),
-            'overall_risk_level': max(severity_counts.items(), key=lambda x: x[1])[0]
-        }
+        aggregate = RiskAggregate().update(risk_analyses)
+        if partial is not None:
+            aggregate.merge(partial)
+        return aggregate.report()
     
     def generate_risk_report(self):
         """Générer un rapport complet d'analyse des risques"""
@@ -1,13 +1,33 @@
 import json
+import re
 from datetime import datetime
 import os
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
 from dotenv import load_dotenv
 import google.generativeai as genai
 
 load_dotenv()
 
+# The only non-ASCII characters whose str.lower() contains ASCII. ASCII lowercasing leaves
+# them untouched, so keyword patterns match them directly
+_KELVIN_SIGN = '\u212a'  # lowercases to 'k'
+_DOTTED_CAPITAL_I = '\u0130'  # lowercases to 'i' followed by a combining dot
+
+def _keyword_regex(keyword):
+    """Regex finding `keyword` in ASCII-lowercased text as `in` would in the `str.lower` text"""
+    pattern = ''.join(f'[k{_KELVIN_SIGN}]' if ch == 'k' else re.escape(ch) for ch in keyword)
+    # The combining dot after 'İ' breaks any match, unless the keyword ends on that 'i'
+    if keyword.endswith('i'):
+        pattern = pattern[:-1] + f'(?:i|{_DOTTED_CAPITAL_I})'
+    return pattern
+
 class RiskAnalyzer:
-    def __init__(self):
+    def __init__(self, triage_model=None):
+        self.triage_model = triage_model
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
         genai.configure(api_key=self.gemini_api_key)
         self.model = genai.GenerativeModel('gemini-pro')
@@ -19,6 +39,7 @@ class RiskAnalyzer:
             'stock': ['unavailable', 'out of stock', 'inventory'],
             'price': ['expensive', 'overpriced', 'cost']
         }
+        self.negative_keywords = ['bad', 'terrible', 'awful', 'worst', 'poor']
     
     def categorize_risk(self, text):
         """Categorize the risk based on keywords"""
@@ -31,6 +52,78 @@ class RiskAnalyzer:
                 
         return risks if risks else ['uncategorized']
     
+    def _review_text(self, reviews):
+        """Return the text column lowercased for keyword matching like `str.lower`"""
+        if isinstance(reviews, pd.DataFrame):
+            text = pa.array(reviews['text'], type=pa.string())
+        else:
+            text = reviews.column('text').combine_chunks()
+        if text.null_count:
+            raise ValueError("Reviews must all have a 'text' value")
+        
+        # For ASCII keywords, ASCII lowercasing only differs from str.lower on the Kelvin sign
+        # and 'İ', which _keyword_regex matches directly. A non-ASCII keyword needs the real
+        # str.lower, so the non-ASCII texts are then lowercased in Python
+        lowered = pc.ascii_lower(text)
+        keywords = self.negative_keywords + [k for ks in self.risk_categories.values() for k in ks]
+        if not all(keyword.isascii() for keyword in keywords):
+            non_ascii = pc.invert(pc.string_is_ascii(text))
+            if pc.any(non_ascii).as_py():
+                replacements = pa.array(
+                    [value.lower() for value in pc.filter(text, non_ascii).to_pylist()],
+                    type=text.type
+                )
+                lowered = pc.replace_with_mask(lowered, non_ascii, replacements)
+        return lowered
+    
+    def _keyword_masks(self, text, keyword_lists):
+        """One boolean mask per keyword list, `any(keyword in text for keyword in keywords)`"""
+        # Polars' regex engine runs literal alternations with SIMD prefilters, several times
+        # faster than Arrow's RE2 kernels, and evaluates the expressions in parallel
+        frame = pl.DataFrame({'text': pl.from_arrow(text)})
+        masks = frame.select([
+            pl.col('text').str.contains('|'.join(map(_keyword_regex, keywords))).alias(str(i))
+            for i, keywords in enumerate(keyword_lists)
+        ])
+        return [mask.to_numpy() for mask in masks.get_columns()]
+    
+    def analyze_risk_batch(self, reviews):
+        """Category flags and negative-review mask of a DataFrame or Arrow table of reviews"""
+        text = self._review_text(reviews)
+        masks = self._keyword_masks(text, list(self.risk_categories.values()) + [self.negative_keywords])
+        return self._category_flags(masks[:-1], self._index(reviews)), masks[-1]
+    
+    def categorize_risk_batch(self, reviews):
+        """Categorize a DataFrame or Arrow table of reviews, one boolean column per category"""
+        text = self._review_text(reviews)
+        masks = self._keyword_masks(text, list(self.risk_categories.values()))
+        return self._category_flags(masks, self._index(reviews))
+    
+    def _index(self, reviews):
+        return reviews.index if isinstance(reviews, pd.DataFrame) else pd.RangeIndex(reviews.num_rows)
+    
+    def _category_flags(self, masks, index):
+        """Build the category flags from one keyword mask per category"""
+        flags = pd.DataFrame(dict(zip(self.risk_categories, masks)), index=index)
+        flags['uncategorized'] = ~flags.any(axis=1)
+        return flags
+    
+    def count_risks_batch(self, flags):
+        """Count risk categories in the same order as the per-review loop"""
+        counts = flags.sum(axis=0)
+        present = [category for category in flags.columns if counts[category] > 0]
+        if not present:
+            return {}
+        
+        # A category is first counted on the first review that raises it
+        first_seen = flags[present].to_numpy().argmax(axis=0)
+        order = sorted(range(len(present)), key=lambda i: (first_seen[i], i))
+        return {present[i]: int(counts[present[i]]) for i in order}
+    
+    def negative_mask_batch(self, reviews):
+        """Boolean mask of the reviews containing a negative keyword"""
+        return self._keyword_masks(self._review_text(reviews), [self.negative_keywords])[0]
+    
     def analyze_reviews_with_ai(self, reviews, max_samples=100):
         """Use Google's Gemini to analyze reviews and identify risks"""
         if len(reviews) > max_samples:
@@ -83,15 +176,45 @@ class RiskAnalyzer:
         report['risk_categories'] = risk_counts
         
         # Analyze high priority reviews with AI
-        negative_reviews = [
-            review for review in reviews 
-            if any(negative in review['text'].lower() 
-                  for negative in ['bad', 'terrible', 'awful', 'worst', 'poor'])
-        ]
+        if self.triage_model is not None:
+            # Only the top-risk fraction allowed by the triage budget goes to Gemini
+            selected = self.triage_model.select([review['text'] for review in reviews], max_items=10)
+            negative_reviews = [reviews[i] for i in selected]
+        else:
+            negative_reviews = [
+                review for review in reviews 
+                if any(negative in review['text'].lower() 
+                      for negative in self.negative_keywords)
+            ]
         if negative_reviews:
             report['high_priority_issues'] = self.analyze_reviews_with_ai(negative_reviews[:10])
         
         return report
+    
+    def generate_risk_report_batch(self, reviews):
+        """Generate the risk report from a DataFrame or Arrow table of reviews"""
+        flags, negative = self.analyze_risk_batch(reviews)
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'total_reviews': len(reviews),
+            'risk_categories': self.count_risks_batch(flags),
+            'high_priority_issues': []
+        }
+        
+        # Analyze high priority reviews with AI
+        if self.triage_model is not None:
+            texts = reviews['text'] if isinstance(reviews, pd.DataFrame) else reviews.column('text').to_pylist()
+            selected = self.triage_model.select(texts, max_items=10)
+        else:
+            selected = np.flatnonzero(negative)[:10]
+        if len(selected):
+            if isinstance(reviews, pd.DataFrame):
+                negative_reviews = reviews.iloc[selected].to_dict('records')
+            else:
+                negative_reviews = reviews.take(selected).to_pylist()
+            report['high_priority_issues'] = self.analyze_reviews_with_ai(negative_reviews)
+        
+        return report
 
 if __name__ == "__main__":
     # Example usage
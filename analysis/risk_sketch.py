@@ -0,0 +1,240 @@
+import hashlib
+import heapq
+import re
+
+import numpy as np
+
+SEVERITY_LEVELS = ['high', 'medium', 'low']
+TOKEN_FIELDS = ['categories', 'issues', 'actions']
+
+
+def tokenize_field(value):
+    """Split a comma-separated Gemini field into normalized, de-duplicated tokens"""
+    if not value:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        value = ','.join(str(v) for v in value)
+
+    tokens = []
+    for part in str(value).split(','):
+        token = re.sub(r'[\[\]*"`]', ' ', part).lower()
+        token = re.sub(r'\s+', ' ', token).strip(" .;:-'")
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def _hash_pair(item):
+    """Stable 64-bit hash pair, identical across processes and runs"""
+    digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class CountMinSketch:
+    def __init__(self, width=2048, depth=4):
+        """Approximate frequency table, estimates never undercount"""
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _columns(self, item):
+        h1, h2 = _hash_pair(item)
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def update(self, item, count=1):
+        self.table[np.arange(self.depth), self._columns(item)] += count
+
+    def estimate(self, item):
+        return int(self.table[np.arange(self.depth), self._columns(item)].min())
+
+    def merge(self, other):
+        """Add another sketch with the same dimensions into this one"""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Count-Min sketches must have the same width and depth to be merged")
+        self.table += other.table
+        return self
+
+    def to_dict(self):
+        return {'width': self.width, 'depth': self.depth, 'table': self.table.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(width=data['width'], depth=data['depth'])
+        sketch.table = np.array(data['table'], dtype=np.int64)
+        return sketch
+
+
+class SpaceSaving:
+    def __init__(self, capacity=100):
+        """Top-k heavy hitters in at most `capacity` counters"""
+        self.capacity = capacity
+        self.counters = {}  # item -> [count, overestimation error]
+        self.heap = []  # (count, item), counts may lag behind self.counters
+
+    def _rebuild_heap(self):
+        self.heap = [(count, item) for item, (count, _) in self.counters.items()]
+        heapq.heapify(self.heap)
+
+    def _pop_min(self):
+        """Remove and return the item with the smallest counter in O(log capacity) amortized"""
+        # Counts only grow, so a stale entry is pushed back with its current count
+        while True:
+            count, item = heapq.heappop(self.heap)
+            if self.counters[item][0] == count:
+                return item
+            heapq.heappush(self.heap, (self.counters[item][0], item))
+
+    def _min_count(self):
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(count for count, _ in self.counters.values())
+
+    def update(self, item, count=1):
+        if item in self.counters:
+            self.counters[item][0] += count
+        elif len(self.counters) < self.capacity:
+            self.counters[item] = [count, 0]
+            heapq.heappush(self.heap, (count, item))
+        else:
+            # Replace the smallest counter, the new item inherits its count as error
+            floor = self.counters.pop(self._pop_min())[0]
+            self.counters[item] = [floor + count, floor]
+            heapq.heappush(self.heap, (floor + count, item))
+
+    def merge(self, other):
+        """Combine two summaries, an item missing from one side may have up to its minimum count"""
+        if self.capacity != other.capacity:
+            raise ValueError("Space-Saving summaries must have the same capacity to be merged")
+        self_floor, other_floor = self._min_count(), other._min_count()
+        merged = {}
+        for item in set(self.counters) | set(other.counters):
+            count, error = self.counters.get(item, [self_floor, self_floor])
+            other_count, other_error = other.counters.get(item, [other_floor, other_floor])
+            merged[item] = [count + other_count, error + other_error]
+
+        kept = sorted(merged.items(), key=lambda kv: kv[1][0], reverse=True)[:self.capacity]
+        self.counters = {item: counter for item, counter in kept}
+        self._rebuild_heap()
+        return self
+
+    def top(self, n=10):
+        """Return the `n` most frequent items as (item, count, error) tuples"""
+        ranked = sorted(self.counters.items(), key=lambda kv: (-kv[1][0], kv[0]))
+        return [(item, count, error) for item, (count, error) in ranked[:n]]
+
+    def to_dict(self):
+        return {
+            'capacity': self.capacity,
+            'counters': {item: list(counter) for item, counter in self.counters.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(capacity=data['capacity'])
+        summary.counters = {item: list(counter) for item, counter in data['counters'].items()}
+        summary._rebuild_heap()
+        return summary
+
+
+class RiskAggregate:
+    def __init__(self, capacity=100, width=2048, depth=4):
+        """Mergeable streaming aggregate of parsed Gemini risk analyses"""
+        self.capacity = capacity
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.severity_counts = {level: 0 for level in SEVERITY_LEVELS}
+        self.heavy_hitters = {field: SpaceSaving(capacity) for field in TOKEN_FIELDS}
+        self.frequencies = {field: CountMinSketch(width, depth) for field in TOKEN_FIELDS}
+
+    def add(self, analysis):
+        """Fold one parsed analysis (as returned by analyze_review_risks) into the aggregate"""
+        self.total += 1
+
+        severity = tokenize_field(analysis.get('severity', ''))
+        if severity and severity[0] in self.severity_counts:
+            self.severity_counts[severity[0]] += 1
+
+        for field in TOKEN_FIELDS:
+            for token in tokenize_field(analysis.get(field, '')):
+                self.heavy_hitters[field].update(token)
+                self.frequencies[field].update(token)
+        return self
+
+    def update(self, analyses):
+        for analysis in analyses:
+            self.add(analysis)
+        return self
+
+    def merge(self, other):
+        """Combine a partial aggregate from another worker or a past run"""
+        if self._params() != other._params():
+            raise ValueError(
+                f"Cannot merge aggregates with different sketch parameters: "
+                f"{self._params()} != {other._params()}"
+            )
+        self.total += other.total
+        for level in SEVERITY_LEVELS:
+            self.severity_counts[level] += other.severity_counts[level]
+        for field in TOKEN_FIELDS:
+            self.heavy_hitters[field].merge(other.heavy_hitters[field])
+            self.frequencies[field].merge(other.frequencies[field])
+        return self
+
+    def _params(self):
+        return {'capacity': self.capacity, 'width': self.width, 'depth': self.depth}
+
+    def estimate(self, field, token):
+        """Estimated number of analyses mentioning `token` in `field`"""
+        normalized = tokenize_field(token)
+        return self.frequencies[field].estimate(normalized[0]) if normalized else 0
+
+    def top(self, field, n=10):
+        """Most frequent tokens of a field as (token, count, error) tuples"""
+        return self.heavy_hitters[field].top(n)
+
+    def to_dict(self):
+        return {
+            **self._params(),
+            'total': self.total,
+            'severity_counts': dict(self.severity_counts),
+            'heavy_hitters': {f: s.to_dict() for f, s in self.heavy_hitters.items()},
+            'frequencies': {f: s.to_dict() for f, s in self.frequencies.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregate = cls(capacity=data['capacity'], width=data['width'], depth=data['depth'])
+        aggregate.total = data['total']
+        aggregate.severity_counts.update(data['severity_counts'])
+        aggregate.heavy_hitters = {
+            f: SpaceSaving.from_dict(s) for f, s in data['heavy_hitters'].items()
+        }
+        aggregate.frequencies = {
+            f: CountMinSketch.from_dict(s) for f, s in data['frequencies'].items()
+        }
+        for field in TOKEN_FIELDS:
+            if (aggregate.heavy_hitters[field].capacity != aggregate.capacity
+                    or (aggregate.frequencies[field].width, aggregate.frequencies[field].depth)
+                    != (aggregate.width, aggregate.depth)):
+                raise ValueError(f"Sketch parameters of '{field}' do not match the aggregate")
+        return aggregate
+
+    def report(self, top_n=10):
+        """Summarize the aggregate in the format of GeminiRiskAnalyzer.aggregate_risk_analysis"""
+        if not self.total:
+            return None
+
+        return {
+            'total_reviews_analyzed': self.total,
+            'risk_categories': [token for token, _, _ in self.top('categories', top_n)],
+            'severity_distribution': {
+                k: v/self.total*100 for k, v in self.severity_counts.items()
+            },
+            'key_recommendations': [token for token, _, _ in self.top('actions', top_n)],
+            'top_issues': [
+                {'issue': token, 'count': count, 'error': error}
+                for token, count, error in self.top('issues', top_n)
+            ],
+            'overall_risk_level': max(self.severity_counts.items(), key=lambda x: x[1])[0]
+        }
@@ -1,6 +1,7 @@
 import pandas as pd
 from walmart_analysis import WalmartRiskAnalyzer
 from genai_analysis import GeminiRiskAnalyzer
+from triage import ReviewTriageModel
 
 def main():
     # Charger les données
@@ -16,7 +17,9 @@ def main():
     
     print("\n2. Analyse avancée avec Gemini AI")
     print("==================================")
-    genai_analyzer = GeminiRiskAnalyzer(df)
+    # Modèle local de tri pour limiter les appels à Gemini aux avis les plus risqués
+    triage_model = ReviewTriageModel(budget=0.1).fit(df)
+    genai_analyzer = GeminiRiskAnalyzer(df, triage_model=triage_model)
     
     # Analyser un échantillon d'avis
     print("\nAnalyse détaillée d'un échantillon d'avis...")
@@ -33,6 +36,10 @@ def main():
         for severity, percentage in batch_analysis['severity_distribution'].items():
             print(f"- {severity.title()}: {percentage:.1f}%")
         
+        print("\nProblèmes les plus fréquents :")
+        for issue in batch_analysis['top_issues']:
+            print(f"- {issue['issue']} ({issue['count']})")
+        
         print(f"\nNiveau de risque global : {batch_analysis['overall_risk_level'].title()}")
         
         print("\nRecommandations clés :")
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+
+class ReviewTriageModel:
+    def __init__(self, budget=0.1, n_features=2 ** 18, ngram_range=(1, 2), batch_size=10000):
+        """Local classifier used to decide which reviews deserve an LLM call"""
+        if not 0 < budget <= 1:
+            raise ValueError("budget must be a fraction in (0, 1]")
+        self.budget = budget
+        self.batch_size = batch_size
+
+        # Hashed n-grams: stateless, so scoring never needs a fitted vocabulary
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=ngram_range,
+            lowercase=True,
+            alternate_sign=False,
+            norm='l2'
+        )
+        self.classifier = SGDClassifier(
+            loss='log_loss',
+            alpha=1e-5,
+            random_state=42
+        )
+        self.is_fitted = False
+
+    def fit(self, df, text_column='Review', epochs=5):
+        """Train on the review text using the `label` column (or Rating > 3 when missing)"""
+        if 'label' in df.columns:
+            labels = df['label']
+        else:
+            labels = (df['Rating'] > 3).astype(int).where(df['Rating'].notna())
+
+        # Unlabeled rows are dropped rather than counted as non-risk
+        labeled = labels.notna().to_numpy()
+        texts = df.loc[labeled, text_column].fillna('').astype(str).tolist()
+
+        # label == 1 is a positive review, the risk class is label == 0
+        y = (labels[labeled].to_numpy() == 0).astype(int)
+        counts = np.bincount(y, minlength=2)
+        if counts.min() == 0:
+            raise ValueError("Triage training data needs both positive and negative reviews")
+
+        # Start from a fresh model so fitting twice or on new data does not reuse old weights.
+        # partial_fit does not accept class_weight='balanced', so it is computed over the full set
+        self.classifier = clone(self.classifier)
+        self.classifier.set_params(class_weight={c: len(y) / (2 * counts[c]) for c in (0, 1)})
+
+        # Hash and train batch by batch so the full sparse matrix never sits in memory.
+        # Rows are shuffled every epoch since scraped files are grouped by product and rating
+        rng = np.random.default_rng(42)
+        for _ in range(epochs):
+            order = rng.permutation(len(texts))
+            for start in range(0, len(texts), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                X = self.vectorizer.transform([texts[i] for i in batch])
+                self.classifier.partial_fit(X, y[batch], classes=[0, 1])
+        self.is_fitted = True
+        return self
+
+    def score(self, texts):
+        """Return the risk probability of each text, scored in sparse batches"""
+        if not self.is_fitted:
+            raise RuntimeError("ReviewTriageModel must be fitted before scoring")
+
+        texts = pd.Series(texts, dtype=object).fillna('').astype(str).tolist()
+        scores = np.empty(len(texts), dtype=np.float64)
+        for start in range(0, len(texts), self.batch_size):
+            X = self.vectorizer.transform(texts[start:start + self.batch_size])
+            scores[start:start + X.shape[0]] = self.classifier.predict_proba(X)[:, 1]
+        return scores
+
+    def select(self, texts, max_items=None):
+        """Return the positions of the highest-risk texts that fit in the budget"""
+        scores = self.score(texts)
+        n = int(np.ceil(len(scores) * self.budget))
+        if max_items is not None:
+            n = min(n, max_items)
+        if n <= 0:
+            return np.array([], dtype=int)
+
+        # argpartition keeps selection linear, then only the kept slice is sorted
+        top = np.argpartition(-scores, n - 1)[:n]
+        return top[np.argsort(-scores[top], kind='stable')]